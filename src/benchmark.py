@@ -0,0 +1,108 @@
+import argparse
+import random
+import tempfile
+import tracemalloc
+from math import log
+from time import perf_counter
+from typing import Callable
+
+from best_sweep import best_sweep
+from generator import LAYOUTS, generate_instance
+from instance import Instance
+from lower_bound import lower_bound
+from solution import Solution
+from tools import sweep
+from transgenetic import local_search, transgenetic
+
+COMPONENTS = ("instance", "lower_bound", "sweep", "solution", "move", "local_search", "best_sweep", "transgenetic")
+
+
+def _measure(function: Callable[[], object], memory: bool) -> tuple[float, float, object]:
+    """Return (seconds, peak MiB allocated, result) of calling 'function'.
+
+    tracemalloc slows Python code down a lot, so the peak memory is measured
+    in a second, traced call (and is 0 when 'memory' is False)."""
+    start = perf_counter()
+    result = function()
+    seconds = perf_counter() - start
+    peak = 0.0
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def _random_moves(solution: Solution, count: int):
+    instance = solution.instance
+    for _ in range(count):
+        node_a = random.randint(1, instance.n)
+        node_b = random.randint(0, instance.n)
+        if node_b == solution.parent_node[node_a] or solution.is_node_in_branch(node_a, node_b): continue
+        solution.move(node_a, node_b, save_state=True)
+        solution.cost()
+        solution.move_back()
+
+
+def benchmark(
+    sizes: list[int],
+    layout: str = "jittered_grid",
+    components: tuple[str, ...] = COMPONENTS,
+    moves: int = 200,
+    seed: int = 0,
+    memory: bool = True
+) -> list[dict[str, float]]:
+    """Time and peak memory of each component on a synthetic instance of each size"""
+    random.seed(seed)
+    rows: list[dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as instance_dir:
+        for n in sizes:
+            name = generate_instance(instance_dir, n, layout, seed=seed)
+            row: dict[str, float] = {"n": n}
+            seconds, peak, instance = _measure(lambda: Instance(instance_dir, name), memory)
+            row["instance"], row["instance_mib"] = seconds, peak
+            edges = sweep(instance, 1, True, instance.max_cable_capacity)
+            solution = Solution(instance, edges)
+            measures: dict[str, Callable[[], object]] = {
+                "lower_bound": lambda: lower_bound(instance),
+                "sweep": lambda: sweep(instance, 1, True, instance.max_cable_capacity),
+                "solution": lambda: Solution(instance, edges),
+                "move": lambda: _random_moves(solution, moves),
+                "local_search": lambda: local_search(Solution(instance, edges)),
+                "best_sweep": lambda: best_sweep(instance),
+                "transgenetic": lambda: transgenetic(instance, 4, max(2, n // 10), 0.5, 0.5, 1, seed=seed),
+            }
+            for component in components:
+                if component in measures:
+                    seconds, peak, _ = _measure(measures[component], memory)
+                    row[component], row[f"{component}_mib"] = seconds, peak
+            rows.append(row)
+    return rows
+
+
+def report(rows: list[dict[str, float]], components: tuple[str, ...] = COMPONENTS):
+    """Print seconds, peak MiB and the empirical exponent k of time ~ n^k against the previous size"""
+    components = tuple(component for component in components if component in rows[0])
+    print(f"{'component':>14} " + " ".join(f"{'n=' + str(int(row['n'])):>24}" for row in rows))
+    for component in components:
+        cells = []
+        for i, row in enumerate(rows):
+            exponent = ""
+            if i > 0 and rows[i-1][component] > 0 and row[component] > 0:
+                exponent = f"n^{log(row[component] / rows[i-1][component]) / log(row['n'] / rows[i-1]['n']):.1f}"
+            cells.append(f"{row[component]:8.3f}s {row[component + '_mib']:6.1f}MiB {exponent:>6}")
+        print(f"{component:>14} " + " ".join(f"{cell:>24}" for cell in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark on synthetic instances")
+    parser.add_argument("sizes", type=int, nargs="+")
+    parser.add_argument("--layout", choices=LAYOUTS, default="jittered_grid")
+    parser.add_argument("--components", nargs="+", choices=COMPONENTS, default=list(COMPONENTS))
+    parser.add_argument("--moves", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced runs measuring peak memory")
+    args = parser.parse_args()
+    rows = benchmark(args.sizes, args.layout, tuple(args.components), args.moves, args.seed, not args.no_memory)
+    report(rows, tuple(args.components))
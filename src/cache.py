@@ -0,0 +1,39 @@
+import os
+import pickle
+from os import path
+from typing import Any
+
+from instance import Instance
+
+# Bump when the way an artifact is computed changes, so stale files are not loaded.
+CACHE_VERSION = 2
+
+
+class ArtifactCache:
+    """On-disk cache of pure functions of an instance, keyed by instance hash, C and parameters"""
+
+    _directory: str
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _filename(self, instance: Instance, artifact: str, parameters: dict[str, Any]) -> str:
+        key = "_".join(f"{name}{parameters[name]}" for name in sorted(parameters))
+        return path.join(self._directory, f"v{CACHE_VERSION}_{instance.hash}_C{instance.C}_{artifact}{'_' + key if key else ''}.pkl")
+
+    def get(self, instance: Instance, artifact: str, **parameters) -> Any | None:
+        """Return the cached artifact, or None if it was never stored"""
+        filename = self._filename(instance, artifact, parameters)
+        if not path.exists(filename):
+            return None
+        with open(filename, "rb") as file:
+            return pickle.load(file)
+
+    def put(self, instance: Instance, artifact: str, value: Any, **parameters):
+        filename = self._filename(instance, artifact, parameters)
+        # Write then rename, so concurrent runs never read a partial file.
+        temporary = f"{filename}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, filename)
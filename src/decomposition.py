@@ -0,0 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+
+import numpy as np
+
+from instance import Instance
+from solution import Solution
+from transgenetic import local_search, transgenetic
+
+
+def sectors(instance: Instance, sector_size: int) -> list[tuple[list[int], int]]:
+    """Split the turbines into contiguous angular sectors of about 'sector_size' turbines.
+
+    Sectors are sized in whole cables of maximum capacity, so the substation
+    connections needed by the farm are spread evenly among them. Return
+    (turbines, C) for each sector, with turbines listed by angle around the
+    substation and the sectors' C adding up to instance.C."""
+    cables_per_sector = max(1, round(sector_size / instance.max_cable_capacity))
+    cables_needed = ceil(instance.n / instance.max_cable_capacity)
+    number_of_sectors = ceil(cables_needed / cables_per_sector)
+
+    cumulative = np.linspace(0, cables_needed, number_of_sectors + 1).round().astype(int)
+    bounds = instance.n * cumulative // cables_needed
+    # Instance orders turbines by an angle in [0, π] that mirrors both sides of the
+    # substation onto each other, so sectors follow the full angle instead, starting
+    # after the widest empty wedge so that no sector wraps around it.
+    angle = np.arctan2(instance.position[1::, 1], instance.position[1::, 0])
+    order = np.argsort(angle, kind="stable")
+    gaps = np.diff(np.append(angle[order], angle[order[0]] + 2 * np.pi))
+    order = np.roll(order, -(int(np.argmax(gaps)) + 1))
+    turbines = (order + 1).tolist()
+    groups = [turbines[bounds[k]:bounds[k+1]] for k in range(number_of_sectors)]
+
+    connections = [ceil(len(group) / instance.max_cable_capacity) for group in groups]
+    if sum(connections) > instance.C:
+        message = f"C ({instance.C}) is too low to serve {number_of_sectors} sectors"
+        raise ValueError(message)
+    # Hand out the remaining connections to the sectors with the most turbines per connection.
+    for _ in range(instance.C - sum(connections)):
+        k = max(range(number_of_sectors), key=lambda k: len(groups[k]) / connections[k])
+        connections[k] += 1
+
+    return list(zip(groups, connections))
+
+
+def sector_instance(instance: Instance, turbines: list[int], C: int) -> Instance:
+    """Sub-instance with the substation and the given turbines, renumbered from 1 in the given order"""
+    return Instance.from_positions(
+        f"{instance.name}_{turbines[0]}_{turbines[-1]}",
+        instance.position[[0] + turbines],
+        instance.cables,
+        C,
+        instance.delta,
+    )
+
+
+def _solve_sector(args) -> list[tuple[int, int]]:
+    instance, turbines, C, parameters = args
+    solution = transgenetic(sector_instance(instance, turbines, C), **parameters)
+    mapping = [0] + turbines
+    return [(mapping[node_a], mapping[node_b]) for [node_a, node_b] in solution.get_edges()]
+
+
+def transgenetic_sectors(
+    instance: Instance,
+    sector_size: int,
+    pop_size: int,
+    minimum_spanning_tree_branch_size: int,
+    prob_plasmid: float,
+    prob_sb_transposon: float,
+    number_of_generations: int,
+    seed: int=0,
+    boundary_size: int=3,
+    max_workers: int | None = None
+) -> Solution:
+    """Run the transgenetic algorithm on each angular sector in parallel and stitch the results.
+
+    The stitched tree is repaired by a local search started from the
+    'boundary_size' turbines on each side of every sector boundary."""
+    parameters = {
+        "pop_size": pop_size,
+        "minimum_spanning_tree_branch_size": minimum_spanning_tree_branch_size,
+        "prob_plasmid": prob_plasmid,
+        "prob_sb_transposon": prob_sb_transposon,
+        "number_of_generations": number_of_generations,
+        "seed": seed,
+    }
+    sector_list = sectors(instance, sector_size)
+
+    # Workers attach to the instance's shared memory instead of unpickling its arrays.
+    published = instance.shared_name is None
+    instance.publish()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            edges_list = list(executor.map(_solve_sector, [
+                (instance, turbines, C, parameters) for [turbines, C] in sector_list
+            ]))
+    finally:
+        if published: instance.unpublish()
+
+    solution = Solution(instance, [edge for edges in edges_list for edge in edges])
+
+    boundary_nodes: list[int] = []
+    for [turbines, _] in sector_list:
+        boundary_nodes += turbines[:boundary_size] + turbines[-boundary_size:]
+    local_search(solution, nodes=boundary_nodes)
+
+    return solution
@@ -0,0 +1,134 @@
+from math import ceil, sqrt
+from os import path
+
+import numpy as np
+from nptyping import Float, NDArray, Shape
+
+# (capacity, cost_per_meter) of each cable type. "default" is the catalogue of the shipped instances.
+CABLE_CATALOGUES: dict[str, list[tuple[int, int]]] = {
+    "default": [(5, 430), (7, 480), (12, 610)],
+    "wide": [(6, 430), (8, 480), (14, 610)],
+    "66kv": [(4, 390), (6, 430), (9, 510), (13, 620), (18, 760)],
+}
+
+LAYOUTS = ("grid", "jittered_grid", "clustered", "irregular")
+
+
+def _grid(n: int, spacing: float) -> NDArray[Shape["*, 2"], Float]:
+    columns = ceil(sqrt(n))
+    rows = ceil(n / columns)
+    x, y = np.meshgrid(np.arange(columns), np.arange(rows))
+    # Stagger every other row, as offshore farms usually do.
+    x = x + 0.5 * (y % 2)
+    return spacing * np.column_stack((x.ravel(), y.ravel()))[:n]
+
+
+def _sample_separated(
+    n: int,
+    spacing: float,
+    rng: np.random.Generator,
+    sample
+) -> NDArray[Shape["*, 2"], Float]:
+    """Draw points from 'sample(rng)' rejecting those closer than half 'spacing' to an accepted one"""
+    points = np.empty((n, 2))
+    count = 0
+    attempts = 0
+    while count < n:
+        attempts += 1
+        if attempts > 1000 * n:
+            raise ValueError(f"Could not place {n} turbines at spacing {spacing}")
+        point = sample(rng)
+        if count > 0 and np.min(np.sum((points[:count] - point) ** 2, axis=1)) < (spacing / 2) ** 2:
+            continue
+        points[count] = point
+        count += 1
+    return points
+
+
+def generate_positions(
+    n: int,
+    layout: str = "grid",
+    spacing: float = 800.0,
+    seed: int = 0
+) -> NDArray[Shape["*, 2"], Float]:
+    """Deterministic positions of 'n' turbines for one of LAYOUTS, about 'spacing' meters apart"""
+    rng = np.random.default_rng(seed)
+    side = spacing * sqrt(n)
+
+    if layout == "grid":
+        return _grid(n, spacing)
+    if layout == "jittered_grid":
+        return _grid(n, spacing) + rng.normal(0.0, 0.15 * spacing, (n, 2))
+    if layout == "clustered":
+        centers = rng.uniform(0.0, side, (max(2, n // 40), 2))
+        def sample(rng: np.random.Generator):
+            return centers[rng.integers(len(centers))] + rng.normal(0.0, 2.0 * spacing, 2)
+        return _sample_separated(n, spacing, rng, sample)
+    if layout == "irregular":
+        # Star-shaped boundary: a circle whose radius is perturbed by a few random harmonics.
+        harmonics = np.arange(2, 6)
+        amplitudes = rng.uniform(0.05, 0.2, len(harmonics))
+        phases = rng.uniform(0.0, 2 * np.pi, len(harmonics))
+        radius = side / 2
+        def sample(rng: np.random.Generator):
+            while True:
+                point = rng.uniform(-radius * 1.5, radius * 1.5, 2)
+                angle = np.arctan2(point[1], point[0])
+                boundary = radius * (1 + np.sum(amplitudes * np.sin(harmonics * angle + phases)))
+                if np.linalg.norm(point) <= boundary:
+                    return point
+        return _sample_separated(n, spacing, rng, sample)
+
+    raise ValueError(f"Unknown layout '{layout}'. Expected one of {LAYOUTS}")
+
+
+def write_instance(
+    instance_dir: str,
+    name: str,
+    positions: NDArray[Shape["*, 2"], Float],
+    substation: tuple[float, float],
+    cables: list[tuple[int, int]],
+    C: int
+):
+    """Write '{name}.turb' and '{name}.cable' in the format read by Instance"""
+    with open(f"{path.join(instance_dir, name)}.turb", "w") as file:
+        file.write(f"{substation[0]:.5f} {substation[1]:.5f} {-C}\n")
+        for [x, y] in positions:
+            file.write(f"{x:.5f} {y:.5f} 1\n")
+    with open(f"{path.join(instance_dir, name)}.cable", "w") as file:
+        for [capacity, cost_per_meter] in cables:
+            file.write(f"    {capacity}  {cost_per_meter} 999\n")
+
+
+def generate_instance(
+    instance_dir: str,
+    n: int,
+    layout: str = "grid",
+    catalogue: str = "default",
+    C: int | None = None,
+    spacing: float = 800.0,
+    seed: int = 0
+) -> str:
+    """Generate a synthetic instance in 'instance_dir' and return its name.
+
+    The substation is placed near the middle of the farm. C is the instance's
+    default substation capacity, which Instance reads as Cmin = C - 1; as in
+    the shipped instances, it defaults to one more than the fewest connections
+    the catalogue's largest cable allows, so that Cmin is still feasible."""
+    cables = CABLE_CATALOGUES[catalogue]
+    fewest_connections = ceil(n / max(capacity for [capacity, _] in cables))
+    if C is None:
+        C = fewest_connections + 1
+    elif C - 1 < fewest_connections:
+        message = f"C ({C}) must exceed the fewest feasible substation connections ({fewest_connections})"
+        raise ValueError(message)
+
+    positions = generate_positions(n, layout, spacing, seed)
+    # Shift the substation off any turbine so that every turbine has a defined angle around it.
+    substation = positions.mean(axis=0) + spacing * np.array([0.25, 0.35])
+    while np.min(np.linalg.norm(positions - substation, axis=1)) < spacing / 4:
+        substation += spacing * np.array([0.1, 0.05])
+
+    name = f"syn_n{n}_{layout}_{catalogue}_C{C}_s{seed:02d}"
+    write_instance(instance_dir, name, positions, (substation[0], substation[1]), cables, C)
+    return name
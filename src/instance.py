@@ -1,9 +1,21 @@
+import hashlib
+import json
+from multiprocessing import shared_memory
 from os import path
 
 import numpy as np
 from nptyping import Float, Int, NDArray, Shape, Structure
 
 
+# Shared memory blocks attached by this process, by name. They stay mapped until the
+# process exits, since arrays taken from an attached instance may outlive it.
+_attached_blocks: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _align(size: int, alignment: int = 64) -> int:
+    return -(-size // alignment) * alignment
+
+
 class Instance:
     _C: int
     _Cmin: int
@@ -11,10 +23,13 @@ class Instance:
     _cables: NDArray[Shape["*"], Structure["[capacity, cost_per_meter, availability]: Int"]]
     _delta: NDArray[Shape["1, 2"], Float]
     _distance: NDArray[Shape["Nodes, Nodes"], Float]
+    _hash: str
     _max_cable_capacity: int
     _name: str
     _nodes: NDArray[Shape["Nodes"], Int]
     _position: NDArray[Shape["Nodes, 2"], Float]
+    _shared_memory: shared_memory.SharedMemory | None = None
+    _shared_owner: bool = False
 
     @property
     def C(self):
@@ -26,6 +41,11 @@ class Instance:
         """Minimum substation's capacity defined by instance"""
         return self._Cmin
 
+    @property
+    def cable_indices(self):
+        """Cable index for each node power from 0 to max_cable_capacity"""
+        return self._cable_indices
+
     @property
     def cables(self):
         """List of cables"""
@@ -41,6 +61,11 @@ class Instance:
         """Distance between node i to j for each i, j from 0 to n"""
         return self._distance
 
+    @property
+    def hash(self):
+        """SHA-256 of the instance's .turb and .cable files"""
+        return self._hash
+
     @property
     def max_cable_capacity(self):
         """Maximum capacity among all cables"""
@@ -78,6 +103,13 @@ class Instance:
         C: int = 0
     ):
         self._name = instance
+
+        file_hash = hashlib.sha256()
+        for extension in ("turb", "cable"):
+            with open(f"{path.join(instance_dir, instance)}.{extension}", "rb") as file:
+                file_hash.update(file.read())
+        self._hash = file_hash.hexdigest()
+
         with open(f"{path.join(instance_dir, instance)}.turb") as file:
             first_line = file.readline().split()
 
@@ -114,14 +146,6 @@ class Instance:
             clockwise_order.append(angle)
         self._position[1::] = self._position[1::][np.argsort(clockwise_order)]
 
-        # Create the matrix of distances between each node i to each node j.
-        self._distance = np.empty((len(self._position), len(self._position)))
-        for i in range(len(self._position)):
-            self._distance[i][i] = 0.0
-            for j in range(i+1, len(self._position)):
-                self._distance[i][j] = np.linalg.norm(self._position[i] - self._position[j])
-                self._distance[j][i] = self._distance[i][j]
-
         cables: list[tuple[int, int, int]] = []
         with open(f"{path.join(instance_dir, instance)}.cable") as file:
             for line in file:
@@ -136,6 +160,44 @@ class Instance:
 
         self._cables = np.array(cables, dtype=[("capacity", "i4"), ("cost_per_meter", "i4"), ("availability", "i4")])
 
+        self._build()
+
+    @classmethod
+    def from_positions(
+        cls,
+        name: str,
+        position: NDArray[Shape["Nodes, 2"], Float],
+        cables: NDArray[Shape["*"], Structure["[capacity, cost_per_meter, availability]: Int"]],
+        C: int,
+        delta: NDArray[Shape["1, 2"], Float] | None = None
+    ) -> "Instance":
+        """Build an instance from node positions relative to the substation (node 0 first).
+
+        Turbines are kept in the given order, so it should already be an angular
+        order around the substation (e.g. a sector of another instance)."""
+        self = cls.__new__(cls)
+        self._name = name
+        self._C = C
+        self._Cmin = C
+        self._delta = np.zeros(2) if delta is None else delta
+        self._position = np.array(position, dtype=float)
+        self._cables = np.sort(np.array(cables), order=["capacity", "cost_per_meter", "availability"])
+        file_hash = hashlib.sha256()
+        file_hash.update(self._position.tobytes())
+        file_hash.update(self._cables.tobytes())
+        self._hash = file_hash.hexdigest()
+        self._build()
+        return self
+
+    def _build(self):
+        # Create the matrix of distances between each node i to each node j.
+        self._distance = np.empty((len(self._position), len(self._position)))
+        for i in range(len(self._position)):
+            self._distance[i][i] = 0.0
+            for j in range(i+1, len(self._position)):
+                self._distance[i][j] = np.linalg.norm(self._position[i] - self._position[j])
+                self._distance[j][i] = self._distance[i][j]
+
         self._max_cable_capacity = self._cables[-1]["capacity"]
 
         # Aux list for getting cable index from node_power
@@ -152,3 +214,93 @@ class Instance:
         self._cable_indices = np.array(cable_indices)
 
         self._nodes = np.array(range(len(self._position)))
+
+    _SHARED_ARRAYS = ("_position", "_distance", "_cables", "_cable_indices")
+
+    @property
+    def shared_name(self) -> str | None:
+        """Name of the shared memory block holding this instance, if published or attached"""
+        return None if self._shared_memory is None else self._shared_memory.name
+
+    def publish(self) -> str:
+        """Copy the instance's arrays into one shared memory block and return its name.
+
+        Other processes can get a read-only, zero-copy instance with
+        Instance.attach(name). While published, pickling the instance only sends
+        the name. Call unpublish() to release the block."""
+        if self._shared_memory is not None:
+            return self._shared_memory.name
+
+        arrays: dict[str, list] = {}
+        offset = 0
+        for field in self._SHARED_ARRAYS:
+            array = getattr(self, field)
+            arrays[field] = [offset, list(array.shape), array.dtype.descr if array.dtype.names else array.dtype.str]
+            offset += _align(array.nbytes)
+        header = json.dumps({
+            "name": self._name,
+            "C": int(self._C),
+            "Cmin": int(self._Cmin),
+            "delta": self._delta.tolist(),
+            "hash": self._hash,
+            "arrays": arrays,
+        }).encode()
+        data_offset = _align(8 + len(header))
+
+        block = shared_memory.SharedMemory(create=True, size=data_offset + max(offset, 1))
+        block.buf[0:8] = len(header).to_bytes(8, "little")
+        block.buf[8:8+len(header)] = header
+        for field in self._SHARED_ARRAYS:
+            array = getattr(self, field)
+            start = data_offset + arrays[field][0]
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=start)
+            view[...] = array
+
+        self._shared_memory = block
+        self._shared_owner = True
+        return block.name
+
+    def unpublish(self):
+        """Release the shared memory block created by publish()"""
+        if self._shared_memory is not None and self._shared_owner:
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
+            self._shared_owner = False
+
+    @classmethod
+    def attach(cls, name: str) -> "Instance":
+        """Instance backed by the shared memory block published under 'name'. Its arrays are read-only.
+
+        A process maps each block once, however many times it attaches to it."""
+        # Processes started by the publisher share its resource tracker, so attaching
+        # doesn't hand ownership of the block over; only the publisher unlinks it.
+        if name not in _attached_blocks:
+            _attached_blocks[name] = shared_memory.SharedMemory(name=name)
+        block = _attached_blocks[name]
+
+        header_size = int.from_bytes(block.buf[0:8], "little")
+        header = json.loads(bytes(block.buf[8:8+header_size]))
+        data_offset = _align(8 + header_size)
+
+        self = cls.__new__(cls)
+        self._name = header["name"]
+        self._C = header["C"]
+        self._Cmin = header["Cmin"]
+        self._delta = np.array(header["delta"])
+        self._hash = header["hash"]
+        for field, [offset, shape, descr] in header["arrays"].items():
+            dtype = np.dtype([tuple(item) for item in descr] if isinstance(descr, list) else descr)
+            array = np.ndarray(tuple(shape), dtype=dtype, buffer=block.buf, offset=data_offset + offset)
+            array.flags.writeable = False
+            setattr(self, field, array)
+        self._max_cable_capacity = self._cables[-1]["capacity"]
+        self._nodes = np.array(range(len(self._position)))
+        self._shared_memory = block
+        self._shared_owner = False
+        return self
+
+    def __reduce_ex__(self, protocol):
+        if self._shared_memory is not None:
+            return (Instance.attach, (self._shared_memory.name,))
+        return super().__reduce_ex__(protocol)
@@ -0,0 +1,105 @@
+import numpy as np
+from nptyping import Float, NDArray, Shape
+
+from instance import Instance
+
+
+def minimum_spanning_tree_length(distance: NDArray[Shape["Nodes, Nodes"], Float]) -> float:
+    """Total length of the Euclidean minimum spanning tree (Prim's algorithm in O(n²))"""
+    in_tree = np.zeros(len(distance), dtype=bool)
+    in_tree[0] = True
+    fringe_distance = distance[0].copy()
+    fringe_distance[0] = np.inf
+    length = 0.0
+    for _ in range(len(distance) - 1):
+        node = int(np.argmin(fringe_distance))
+        length += fringe_distance[node]
+        in_tree[node] = True
+        fringe_distance = np.minimum(fringe_distance, distance[node])
+        fringe_distance[in_tree] = np.inf
+    return length
+
+
+def _affine_minorants(instance: Instance) -> list[tuple[float, float]]:
+    """Pairs (a, b) with a, b >= 0 and a + b·p <= cost per meter of the cable for power p, for every p.
+
+    These are the edges of the lower convex hull of the cost per meter against
+    power, plus the two lines through the cheapest cable and through the origin."""
+    power = np.arange(1, instance.max_cable_capacity + 1)
+    cost_per_meter = instance.cables["cost_per_meter"][instance.cable_indices[power]].astype(float)
+
+    hull: list[int] = []
+    for i in range(len(power)):
+        while len(hull) >= 2 and (
+            (cost_per_meter[hull[-1]] - cost_per_meter[hull[-2]]) * (power[i] - power[hull[-2]]) >=
+            (cost_per_meter[i] - cost_per_meter[hull[-2]]) * (power[hull[-1]] - power[hull[-2]])
+        ):
+            hull.pop()
+        hull.append(i)
+
+    minorants = [(cost_per_meter.min(), 0.0), (0.0, (cost_per_meter / power).min())]
+    for [i, j] in zip(hull, hull[1::]):
+        b = (cost_per_meter[j] - cost_per_meter[i]) / (power[j] - power[i])
+        a = cost_per_meter[i] - b * power[i]
+        if a >= 0 and b >= 0:
+            minorants.append((a, b))
+    return minorants
+
+
+def _substation_residual_cost(instance: Instance, a: float, b: float, M1: int, M2: int) -> float:
+    """Lower bound on what the cables leaving the substation cost above a + b·power per meter.
+
+    The edges into the substation carry all n units of power through at most C
+    cables (or pay at least M2), and the k-th of them is at least as long as the
+    k-th closest turbine to the substation. Covering n with cable powers,
+    pairing the largest residual costs with the shortest distances, is a bound."""
+    n = instance.n
+    C = min(instance.C, n)
+    if C * instance.max_cable_capacity < n:
+        return min(M2, M1 * (n - C * instance.max_cable_capacity))
+
+    power = np.arange(1, instance.max_cable_capacity + 1)
+    residual = instance.cables["cost_per_meter"][instance.cable_indices[power]] - a - b * power
+    closest = np.sort(instance.distance[0][1::])
+    covered_power = np.arange(n + 1)
+
+    # covered[j][m]: cheapest residual cost of j cables covering at least m units of power.
+    covered = np.full((C + 1, n + 1), np.inf)
+    covered[0][0] = 0.0
+    for i in np.argsort(-residual, kind="stable"):
+        shift = np.maximum(covered_power - power[i], 0)
+        for j in range(C):
+            covered[j+1] = np.minimum(covered[j+1], covered[j][shift] + closest[j] * residual[i])
+    return min(covered[1::, n].min(), M2)
+
+
+def lower_bound(
+    instance: Instance,
+    M1 = 1_000_000_000,
+    M2 = 1_000_000_000,
+) -> float:
+    """Lower bound on the cost of any solution of the instance.
+
+    For any a, b >= 0 with a + b·p below the cost per meter of the cable for
+    power p, an edge costs at least a·length + b·length·power plus its residual.
+    Summed over a spanning tree, the lengths are at least the minimum spanning
+    tree length and the length·power terms (the path length from each turbine
+    to the substation) at least the straight distances to the substation.
+    The residuals are bounded on the substation edges. The best such (a, b) is
+    taken. Crossings are bounded by 0.
+
+    The bound ignores the routing detours and the tiers of the inner cables, so
+    on the shipped instances it sits 25-28% below locally optimal layouts and
+    about as far below the initial sweeps: it certifies costs, but the gap
+    does not yet separate good layouts from poor ones."""
+    tree_length = minimum_spanning_tree_length(instance.distance)
+    radial_length = instance.distance[0][1::].sum()
+    return max(
+        a * tree_length + b * radial_length + _substation_residual_cost(instance, a, b, M1, M2)
+        for [a, b] in _affine_minorants(instance)
+    )
+
+
+def optimality_gap(cost: float, bound: float) -> float:
+    """Relative gap (cost - bound) / cost"""
+    return (cost - bound) / cost if cost > 0 else 0.0
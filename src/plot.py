@@ -1,7 +1,15 @@
+from os import path
+
 import networkx as nx
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
 from instance import Instance
 from solution import Solution
+from tools import node_power
 
 
 def plot(solution: Solution):
@@ -25,3 +33,86 @@ def plot_instance(instance: Instance):
     nx.draw_networkx_nodes(G, pos, nodelist=[0], node_color='#FFA726', node_size=80, node_shape='s')
     nx.draw_networkx_nodes(G, pos, nodelist=instance.nodes[1::], node_color='#BDBDBD', node_size=80)
     nx.draw_networkx_labels(G, pos, font_size=8)
+
+
+def _edge_style(instance: Instance, parent_node: list[int], power: list[int]):
+    """Return segments, widths and colours of the edges (i, parent_node[i]) for i from 1 to n"""
+    parent = np.asarray(parent_node)[1::]
+    power = np.asarray(power)[1::]
+    segments = np.stack((instance.position[1::], instance.position[parent]), axis=1)
+    widths = instance.cable_indices[np.minimum(power, instance.max_cable_capacity)] + 1
+    colors = np.where(power <= instance.max_cable_capacity, '#3E2723', '#D50000')
+    return segments, widths, colors
+
+
+def _draw_nodes(instance: Instance, ax: Axes):
+    ax.scatter(instance.position[1::, 0], instance.position[1::, 1], s=20, c='#BDBDBD', zorder=2)
+    ax.scatter(instance.position[0, 0], instance.position[0, 1], s=40, c='#FFA726', marker='s', zorder=3)
+
+
+def _new_figure(instance: Instance, figsize: tuple[float, float]) -> tuple[Figure, Axes, LineCollection]:
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_aspect('equal')
+    ax.set_axis_off()
+    edges = LineCollection([], zorder=1)
+    ax.add_collection(edges)
+    _draw_nodes(instance, ax)
+    ax.autoscale_view()
+    return figure, ax, edges
+
+
+def draw(solution: Solution, ax: Axes) -> LineCollection:
+    """Draw the solution on 'ax' with all edges as a single LineCollection"""
+    instance = solution.instance
+    segments, widths, colors = _edge_style(instance, solution.parent_node, solution.node_power)
+    edges = LineCollection(segments, linewidths=widths, colors=colors, zorder=1)
+    ax.add_collection(edges)
+    _draw_nodes(instance, ax)
+    ax.set_aspect('equal')
+    ax.autoscale_view()
+    return edges
+
+
+def save(solution: Solution, filename: str, figsize: tuple[float, float] = (8, 8), dpi: int = 100):
+    """Render the solution to a file without pyplot. The format (png, svg, ...) follows the extension"""
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_axis_off()
+    draw(solution, ax)
+    ax.set_title(f"{solution.instance.name}: {solution.cost()}")
+    figure.savefig(filename, dpi=dpi)
+
+
+def render_history(
+    instance: Instance,
+    history: list[tuple[int, list[tuple[int, int]]]],
+    output_dir: str,
+    fmt: str = "png",
+    figsize: tuple[float, float] = (8, 8),
+    dpi: int = 100
+) -> list[str]:
+    """Render each (cost, edges) incumbent of a run as a frame in 'output_dir'.
+
+    The figure is built once; only the edge collection and the title are
+    updated between frames. Return the list of written files."""
+    figure, ax, edges = _new_figure(instance, figsize)
+    title = ax.set_title("")
+    filenames: list[str] = []
+    parent_node = [0 for _ in instance.nodes]
+
+    for frame, (cost, frame_edges) in enumerate(history):
+        for [node_a, node_b] in frame_edges:
+            parent_node[node_a] = node_b
+        segments, widths, colors = _edge_style(instance, parent_node, node_power(instance.nodes, frame_edges))
+        edges.set_segments(segments)
+        edges.set_linewidths(widths)
+        edges.set_colors(colors)
+        title.set_text(f"{instance.name} #{frame}: {cost}")
+        filename = path.join(output_dir, f"{instance.name}_{frame:04d}.{fmt}")
+        figure.savefig(filename, dpi=dpi)
+        filenames.append(filename)
+
+    return filenames
@@ -0,0 +1,335 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import stat
+from collections import OrderedDict
+from contextlib import aclosing
+from multiprocessing.connection import Connection
+from typing import Any, AsyncIterator
+
+from instance import Instance
+from transgenetic import transgenetic
+
+# Jobs run in forked processes, so they inherit the imported modules and the warm instances.
+_context = multiprocessing.get_context("fork")
+
+
+def _parent_node(instance: Instance, edges: list[tuple[int, int]]) -> list[int]:
+    parent_node = [0 for _ in instance.nodes]
+    for [node_a, node_b] in edges:
+        parent_node[node_a] = int(node_b)
+    return parent_node
+
+
+def _release_inherited_sockets():
+    """Point every socket descriptor inherited from the service at /dev/null.
+
+    A forked job would otherwise keep the listening socket and other clients'
+    connections open until it exits. The descriptors stay valid, so the
+    socket objects still referring to them can be closed safely."""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    try:
+        for name in os.listdir("/proc/self/fd" if os.path.isdir("/proc/self/fd") else "/dev/fd"):
+            fd = int(name)
+            try:
+                if fd != devnull and stat.S_ISSOCK(os.fstat(fd).st_mode):
+                    os.dup2(devnull, fd)
+            except OSError:
+                pass
+    finally:
+        os.close(devnull)
+
+
+def _solve_job(instance: Instance, parameters: dict[str, Any], connection: Connection):
+    """Process target: run transgenetic, sending ("incumbent" | "done" | "error", payload) messages"""
+    # The job's pipe is an os.pipe, not a socket, so it is left alone.
+    _release_inherited_sockets()
+    try:
+        solution = transgenetic(
+            instance,
+            on_incumbent=lambda cost, edges: connection.send(("incumbent", (int(cost), _parent_node(instance, edges)))),
+            **parameters,
+        )
+        connection.send(("done", (solution.cost(), _parent_node(instance, solution.get_edges()))))
+    except Exception as exception:
+        connection.send(("error", f"{type(exception).__name__}: {exception}"))
+    finally:
+        connection.close()
+
+
+_FINAL_EVENTS = ("done", "cancelled", "error")
+
+
+class _Job:
+    id: int
+    cancelled: asyncio.Event
+    process: multiprocessing.Process | None
+
+    def __init__(self, id: int):
+        self.id = id
+        self.cancelled = asyncio.Event()
+        self.process = None
+
+
+class SolverService:
+    """Long-running solver keeping instances warm and running transgenetic jobs on a bounded pool.
+
+    Jobs beyond 'max_workers' wait in a queue. Each job streams events
+    (dicts with an "event" key): "queued", "started", one "incumbent" per
+    improvement, then "done", "cancelled" or "error". Incumbents carry the
+    cost and the parent of each node."""
+
+    _instances: OrderedDict[tuple[str, str, int], Instance]
+    _jobs: dict[int, _Job]
+    _max_instances: int
+    _next_job: int
+    _slots: asyncio.Semaphore
+
+    def __init__(self, max_workers: int = 2, max_instances: int = 8):
+        self._instances = OrderedDict()
+        self._jobs = {}
+        self._max_instances = max_instances
+        self._next_job = 0
+        self._slots = asyncio.Semaphore(max_workers)
+
+    def get_instance(self, instance_dir: str, instance: str, C: int = 0) -> Instance:
+        """Return the instance from the cache, loading it (and evicting the least recently used) if needed"""
+        key = (instance_dir, instance, C)
+        if key in self._instances:
+            self._instances.move_to_end(key)
+        else:
+            self._instances[key] = Instance(instance_dir, instance, C)
+            if len(self._instances) > self._max_instances:
+                self._instances.popitem(last=False)
+        return self._instances[key]
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job. Return False if there is no such job"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancelled.set()
+        if job.process is not None and job.process.is_alive():
+            job.process.terminate()
+        return True
+
+    def _give_back_slot(self, acquire: asyncio.Future):
+        """Cancel a pending slot acquisition, releasing the slot if it was (or ends up being) taken"""
+        def release_if_acquired(acquire: asyncio.Future):
+            if not acquire.cancelled() and acquire.exception() is None:
+                self._slots.release()
+        if acquire.done():
+            release_if_acquired(acquire)
+        else:
+            acquire.cancel()
+            # The acquisition may still succeed if the slot was handed over just before the cancel.
+            acquire.add_done_callback(release_if_acquired)
+
+    async def _acquire_slot(self, job: _Job) -> bool:
+        """Wait for a free worker, unless the job is cancelled first"""
+        acquire = asyncio.ensure_future(self._slots.acquire())
+        cancelled = asyncio.ensure_future(job.cancelled.wait())
+        try:
+            await asyncio.wait((acquire, cancelled), return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            self._give_back_slot(acquire)
+            raise
+        finally:
+            cancelled.cancel()
+        if acquire.done() and not job.cancelled.is_set():
+            return True
+        self._give_back_slot(acquire)
+        return False
+
+    @staticmethod
+    async def _wait_process(process: multiprocessing.Process):
+        """Wait for the process to exit without blocking the event loop or using threads.
+
+        The process is reaped by the loop even if the waiting task is cancelled."""
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        def on_exit():
+            loop.remove_reader(process.sentinel)
+            process.join()
+            if not exited.done():
+                exited.set_result(None)
+        loop.add_reader(process.sentinel, on_exit)
+        await asyncio.shield(exited)
+
+    async def solve(
+        self,
+        instance_dir: str,
+        instance: str,
+        C: int = 0,
+        **parameters
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Queue a transgenetic job and yield its events. Closing the iterator cancels the job"""
+        job = _Job(self._next_job)
+        self._next_job += 1
+        self._jobs[job.id] = job
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                warm_instance = self.get_instance(instance_dir, instance, C)
+            except (OSError, ValueError) as exception:
+                yield {"event": "error", "job": job.id, "message": f"{type(exception).__name__}: {exception}"}
+                return
+            yield {"event": "queued", "job": job.id}
+
+            if not await self._acquire_slot(job):
+                yield {"event": "cancelled", "job": job.id}
+                return
+            try:
+                receiver, sender = _context.Pipe(duplex=False)
+                job.process = _context.Process(target=_solve_job, args=(warm_instance, parameters, sender), daemon=True)
+                job.process.start()
+                sender.close()
+                yield {"event": "started", "job": job.id}
+
+                messages: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue()
+                def on_readable():
+                    try:
+                        messages.put_nowait(receiver.recv())
+                    except EOFError:
+                        loop.remove_reader(receiver.fileno())
+                        messages.put_nowait(None)
+                loop.add_reader(receiver.fileno(), on_readable)
+                try:
+                    while True:
+                        message = await messages.get()
+                        if message is None:
+                            if job.cancelled.is_set():
+                                yield {"event": "cancelled", "job": job.id}
+                            else:
+                                yield {"event": "error", "job": job.id, "message": "worker exited unexpectedly"}
+                            return
+                        kind, payload = message
+                        if kind == "incumbent":
+                            yield {"event": "incumbent", "job": job.id, "cost": payload[0], "parent_node": payload[1]}
+                        elif kind == "done":
+                            yield {"event": "done", "job": job.id, "cost": payload[0], "parent_node": payload[1]}
+                            return
+                        else:
+                            yield {"event": "error", "job": job.id, "message": payload}
+                            return
+                finally:
+                    loop.remove_reader(receiver.fileno())
+                    receiver.close()
+            finally:
+                try:
+                    if job.process is not None:
+                        if job.process.is_alive():
+                            job.process.terminate()
+                        await self._wait_process(job.process)
+                finally:
+                    self._slots.release()
+        finally:
+            del self._jobs[job.id]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one connection speaking JSON lines.
+
+        {"op": "solve", "instance_dir": ..., "instance": ..., "C": 0, "parameters": {...}}
+        streams the job's events, one JSON object per line, and the connection
+        closing cancels the job. {"op": "cancel", "job": id} answers with
+        {"event": "cancel", "job": id, "ok": bool}."""
+        watcher: asyncio.Task | None = None
+        try:
+            line = await reader.readline()
+            request = json.loads(line)
+            if request.get("op") == "cancel":
+                writer.write((json.dumps({"event": "cancel", "job": request["job"], "ok": self.cancel(request["job"])}) + "\n").encode())
+            elif request.get("op") == "solve":
+                events = self.solve(request["instance_dir"], request["instance"], request.get("C", 0), **request.get("parameters", {}))
+                async with aclosing(events):
+                    async for event in events:
+                        if watcher is None and "job" in event:
+                            watcher = asyncio.ensure_future(self._cancel_on_disconnect(reader, event["job"]))
+                        writer.write((json.dumps(event) + "\n").encode())
+                        await writer.drain()
+            else:
+                writer.write((json.dumps({"event": "error", "message": f"unknown op {request.get('op')!r}"}) + "\n").encode())
+            await writer.drain()
+        except (ConnectionError, json.JSONDecodeError, KeyError):
+            pass
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            writer.close()
+
+    async def _cancel_on_disconnect(self, reader: asyncio.StreamReader, job_id: int):
+        """Cancel the job as soon as the client closes its side of the connection"""
+        try:
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        self.cancel(job_id)
+
+    async def serve(self, socket_path: str):
+        """Listen on a Unix socket until cancelled"""
+        server = await asyncio.start_unix_server(self.handle, socket_path)
+        async with server:
+            await server.serve_forever()
+
+
+class ServiceClient:
+    """Client of a SolverService listening on a Unix socket"""
+
+    _socket_path: str
+
+    def __init__(self, socket_path: str):
+        self._socket_path = socket_path
+
+    async def solve(self, instance_dir: str, instance: str, C: int = 0, **parameters) -> AsyncIterator[dict[str, Any]]:
+        reader, writer = await asyncio.open_unix_connection(self._socket_path)
+        try:
+            request = {"op": "solve", "instance_dir": instance_dir, "instance": instance, "C": C, "parameters": parameters}
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            while line := await reader.readline():
+                event = json.loads(line)
+                yield event
+                if event["event"] in _FINAL_EVENTS:
+                    return
+        finally:
+            writer.close()
+
+    async def cancel(self, job_id: int) -> bool:
+        reader, writer = await asyncio.open_unix_connection(self._socket_path)
+        try:
+            writer.write((json.dumps({"op": "cancel", "job": job_id}) + "\n").encode())
+            await writer.drain()
+            return json.loads(await reader.readline())["ok"]
+        finally:
+            writer.close()
+
+
+class LocalClient:
+    """Client with the ServiceClient interface calling a SolverService in the same event loop, for tests"""
+
+    _service: SolverService
+
+    def __init__(self, service: SolverService):
+        self._service = service
+
+    async def solve(self, instance_dir: str, instance: str, C: int = 0, **parameters) -> AsyncIterator[dict[str, Any]]:
+        # Round-trip through JSON so events look exactly like those read from the socket.
+        async with aclosing(self._service.solve(instance_dir, instance, C, **parameters)) as events:
+            async for event in events:
+                yield json.loads(json.dumps(event))
+
+    async def cancel(self, job_id: int) -> bool:
+        return self._service.cancel(job_id)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Transgenetic solver service")
+    parser.add_argument("socket_path")
+    parser.add_argument("--max-workers", type=int, default=2)
+    parser.add_argument("--max-instances", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(SolverService(args.max_workers, args.max_instances).serve(args.socket_path))
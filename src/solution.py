@@ -17,9 +17,12 @@ class Solution:
     _connections_to_substation: int
     _cost_for_cables: float
     _instance: Instance
+    _journal: list[tuple[str, int, object]]
+    _journal_marks: list[int]
     _node_power: list[int]
     _number_of_crossings: int
     _parent_node: list[int]
+    _save_journal: list[tuple[str, int, object]]
 
     @property
     def node_power(self):
@@ -53,9 +56,18 @@ class Solution:
         self._children_node = [set() for _ in instance.nodes]
         self._instance = instance
         self._parent_node = [0 for _ in instance.nodes]
+        self._journal = []
+        self._journal_marks = []
+        self._save_journal = []
         self.build(edges)
 
     def build(self, edges: list[tuple[int, int]], ignore_crossings=False):
+        if len(self._journal_marks) > 0:
+            self._journal.append(("state", 0, (
+                self._parent_node.copy(),
+                self._node_power.copy(),
+                (self._cost_for_cables, self._connections_to_substation, self._number_of_crossings),
+            )))
         for node_set in self._children_node:
             node_set.clear()
         for [node_a, node_b] in edges:
@@ -127,19 +139,25 @@ class Solution:
     def move(self, child_node: int, parent_node: int, save_state=False):
         """Disconnect 'child_node' from its parent node and connect it to 'parent_node'.
 
-        Be careful to not break the tree (creating cycles or disconnecting a branch entirely)."""
+        Be careful to not break the tree (creating cycles or disconnecting a branch entirely).
+        With 'save_state', the move can be undone with move_back()."""
+        journal = [] if save_state or len(self._journal_marks) > 0 else None
+        self._move(child_node, parent_node, journal)
         if save_state:
-            self._child_node_save = child_node
-            self._parent_node_save = self._parent_node[child_node]
-            self._node_power_save = self._node_power.copy()
-            self._cost_for_cables_save = self._cost_for_cables
-            self._connections_to_substation_save = self._connections_to_substation
-            self._number_of_crossings_save = self._number_of_crossings
+            self._save_journal = journal
+        if len(self._journal_marks) > 0:
+            self._journal.extend(journal)
+
+    def _move(self, child_node: int, parent_node: int, journal: list[tuple[str, int, object]] | None):
+        if journal is not None:
+            journal.append(("cost", 0, (self._cost_for_cables, self._connections_to_substation, self._number_of_crossings)))
+            journal.append(("parent", child_node, self._parent_node[child_node]))
 
         node = self._parent_node[child_node]
         self._cost_for_cables -= cable_cost(self._instance, child_node, node, self._node_power[child_node], self._M1)
         while node != 0:
             next_node = self._parent_node[node]
+            if journal is not None: journal.append(("power", node, self._node_power[node]))
             self._cost_for_cables -= cable_cost(self._instance, node, next_node, self._node_power[node], self._M1)
             self._node_power[node] -= self._node_power[child_node]
             self._cost_for_cables += cable_cost(self._instance, node, next_node, self._node_power[node], self._M1)
@@ -148,6 +166,7 @@ class Solution:
         self._cost_for_cables += cable_cost(self._instance, child_node, node, self._node_power[child_node], self._M1)
         while node != 0:
             next_node = self._parent_node[node]
+            if journal is not None: journal.append(("power", node, self._node_power[node]))
             self._cost_for_cables -= cable_cost(self._instance, node, next_node, self._node_power[node], self._M1)
             self._node_power[node] += self._node_power[child_node]
             self._cost_for_cables += cable_cost(self._instance, node, next_node, self._node_power[node], self._M1)
@@ -184,13 +203,56 @@ class Solution:
                 self._instance.position[i],
                 self._instance.position[self._parent_node[i]])
 
+    def _undo(self, entries: list[tuple[str, int, object]], journal: list[tuple[str, int, object]] | None):
+        """Restore the values recorded in 'entries', newest first, logging the overwritten ones to 'journal'"""
+        for [kind, key, value] in reversed(entries):
+            if kind == "power":
+                if journal is not None: journal.append(("power", key, self._node_power[key]))
+                self._node_power[key] = value
+            elif kind == "parent":
+                if journal is not None: journal.append(("parent", key, self._parent_node[key]))
+                self._just_move(key, value)
+            elif kind == "cost":
+                if journal is not None: journal.append(("cost", 0, (self._cost_for_cables, self._connections_to_substation, self._number_of_crossings)))
+                self._cost_for_cables, self._connections_to_substation, self._number_of_crossings = value
+            else: # "state", logged by build()
+                if journal is not None: journal.append(("state", 0, (
+                    self._parent_node.copy(),
+                    self._node_power.copy(),
+                    (self._cost_for_cables, self._connections_to_substation, self._number_of_crossings),
+                )))
+                parent_node, node_power, costs = value
+                for node_set in self._children_node:
+                    node_set.clear()
+                for node in self._instance.nodes[1::]:
+                    self._parent_node[node] = parent_node[node]
+                    self._children_node[parent_node[node]].add(node)
+                self._node_power = node_power.copy()
+                self._cost_for_cables, self._connections_to_substation, self._number_of_crossings = costs
+
     def move_back(self):
         """Move back to previous saved state move."""
-        self._just_move(self._child_node_save, self._parent_node_save)
-        self._cost_for_cables = self._cost_for_cables_save
-        self._connections_to_substation = self._connections_to_substation_save
-        self._number_of_crossings = self._number_of_crossings_save
-        self._node_power = self._node_power_save.copy()
+        self._undo(self._save_journal, self._journal if len(self._journal_marks) > 0 else None)
+        self._save_journal = []
+
+    def begin(self):
+        """Open a transaction. Transactions can be nested.
+
+        Each subsequent move logs only the parents, powers and costs it changes,
+        so rollback() costs as much as the changes made since begin()."""
+        self._journal_marks.append(len(self._journal))
+
+    def commit(self):
+        """Close the innermost transaction keeping its moves"""
+        self._journal_marks.pop()
+        if len(self._journal_marks) == 0:
+            self._journal.clear()
+
+    def rollback(self):
+        """Close the innermost transaction undoing its moves"""
+        mark = self._journal_marks.pop()
+        self._undo(self._journal[mark:], None)
+        del self._journal[mark:]
 
     def is_node_in_branch(self, branch_root: int, node: int):
         if branch_root == node: return True
@@ -0,0 +1,73 @@
+import json
+import sqlite3
+from typing import Any
+
+from instance import Instance
+from solution import Solution
+
+
+class SolutionStore:
+    """Persistent SQLite store of solutions keyed by instance name, instance hash and C"""
+
+    _connection: sqlite3.Connection
+
+    def __init__(self, filename: str):
+        self._connection = sqlite3.connect(filename)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            "  instance_name TEXT NOT NULL,"
+            "  instance_hash TEXT NOT NULL,"
+            "  C INTEGER NOT NULL,"
+            "  cost INTEGER NOT NULL,"
+            "  cost_for_cables REAL NOT NULL,"
+            "  connections_to_substation INTEGER NOT NULL,"
+            "  number_of_crossings INTEGER NOT NULL,"
+            "  parent_node TEXT NOT NULL,"
+            "  seed INTEGER,"
+            "  parameters TEXT NOT NULL,"
+            "  created TIMESTAMP DEFAULT CURRENT_TIMESTAMP,"
+            "  UNIQUE (instance_hash, C, parent_node)"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS solutions_by_cost ON solutions (instance_hash, C, cost)"
+        )
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    def save(self, solution: Solution, seed: int | None = None, parameters: dict[str, Any] | None = None):
+        """Record a solution. A layout identical to one already stored for the same instance and C is ignored"""
+        instance = solution.instance
+        self._connection.execute(
+            "INSERT OR IGNORE INTO solutions ("
+            "  instance_name, instance_hash, C, cost, cost_for_cables,"
+            "  connections_to_substation, number_of_crossings, parent_node, seed, parameters"
+            ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                instance.name,
+                instance.hash,
+                int(instance.C),
+                solution.cost(),
+                float(solution.cost_for_cables()),
+                solution.connections_to_substation(),
+                solution.number_of_crossings(),
+                json.dumps([int(node) for node in solution.parent_node]),
+                seed,
+                json.dumps(parameters or {}),
+            ),
+        )
+        self._connection.commit()
+
+    def best(self, instance: Instance, k: int = 1) -> list[list[tuple[int, int]]]:
+        """Return the edges of the 'k' cheapest stored solutions for the instance and its C"""
+        rows = self._connection.execute(
+            "SELECT parent_node FROM solutions WHERE instance_hash = ? AND C = ? ORDER BY cost LIMIT ?",
+            (instance.hash, int(instance.C), k),
+        ).fetchall()
+        edges_list: list[list[tuple[int, int]]] = []
+        for [parent_node] in rows:
+            parent_node = json.loads(parent_node)
+            edges_list.append([(node, parent_node[node]) for node in instance.nodes[1::]])
+        return edges_list
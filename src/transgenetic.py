@@ -1,9 +1,16 @@
 import random
+from collections import deque
 from time import time
+from typing import Callable, Iterable
+
+import numpy as np
 
 from best_sweep import best_sweep
+from cache import ArtifactCache
 from instance import Instance
+from lower_bound import lower_bound, optimality_gap
 from solution import Solution
+from store import SolutionStore
 from tools import prim, sweep
 
 
@@ -17,9 +24,19 @@ def cut_branch(solution: Solution, branch_root: int) -> list[tuple[int, int]]:
     return edges
 
 
-def generate_population(instance: Instance, pop_size: int) -> list[Solution]:
+def _cached(cache: ArtifactCache | None, instance: Instance, artifact: str, compute, **parameters):
+    if cache is None:
+        return compute()
+    value = cache.get(instance, artifact, **parameters)
+    if value is None:
+        value = compute()
+        cache.put(instance, artifact, value, **parameters)
+    return value
+
+
+def ranked_sweeps(instance: Instance) -> list[list[tuple[int, int]]]:
+    """All distinct sweeps of the instance, sorted by cost"""
     sweep_list: list[list[tuple[int, int]]] = []
-    # Add all sweeps
     for starting_turbine in instance.nodes[1::]:
         for clockwise in (False, True):
             for tpg in range(instance.n // instance.C, instance.max_cable_capacity + 1):
@@ -27,9 +44,28 @@ def generate_population(instance: Instance, pop_size: int) -> list[Solution]:
                 edges.sort()
                 if edges not in sweep_list:
                     sweep_list.append(edges)
-    population = [Solution(instance, edges) for edges in sweep_list]
-    population.sort(key=lambda solution: solution.cost())
-    population = population[0:pop_size-2]
+    costs = [Solution(instance, edges).cost() for edges in sweep_list]
+    order = sorted(range(len(sweep_list)), key=lambda i: costs[i])
+    return [sweep_list[i] for i in order]
+
+
+def generate_population(
+    instance: Instance,
+    pop_size: int,
+    warm_start: list[list[tuple[int, int]]] | None = None,
+    cache: ArtifactCache | None = None
+) -> list[Solution]:
+    """Build the initial population from the best sweeps, Prim and the all-to-substation tree.
+
+    Layouts in 'warm_start' (e.g. from a SolutionStore) replace the worst sweeps,
+    up to half of the population."""
+    if warm_start is None: warm_start = []
+    warm_start = warm_start[0:pop_size//2]
+    # Add the best sweeps
+    sweep_list = _cached(cache, instance, "sweeps", lambda: ranked_sweeps(instance))
+    population = [Solution(instance, edges) for edges in sweep_list[0:max(0, pop_size-2-len(warm_start))]]
+    # Add warm start layouts
+    population += [Solution(instance, edges) for edges in warm_start]
     # Add prim
     population.append(Solution(instance, prim(instance.nodes, instance.distance, 0)))
     # Add all-turbines-to-substation solution
@@ -37,19 +73,24 @@ def generate_population(instance: Instance, pop_size: int) -> list[Solution]:
     return population[0:pop_size]
 
 
-def initialize_host_repository(instance: Instance, minimum_spanning_tree_branch_size: int) -> list[list[tuple[int, int]]]:
+def _host_repository(
+    instance: Instance,
+    minimum_spanning_tree_branch_size: int,
+    best_sweep_edges: list[tuple[int, int]]
+) -> list[list[tuple[int, int]]]:
     host_repository_list: list[list[tuple[int, int]]] = []
 
     for node in instance.nodes:
         edges = prim(instance.nodes, instance.distance, node, minimum_spanning_tree_branch_size)
+        # When the substation lies inside the turbine field, Prim can hang it below a
+        # turbine. The substation can't be moved, so keep only edges out of turbines.
+        edges = [(node_a, node_b) for [node_a, node_b] in edges if node_a != 0]
         edges.sort()
         if edges not in host_repository_list:
             host_repository_list.append(edges)
 
-    best_sweep_solution = Solution(instance, best_sweep(instance))
-    first_layer_nodes = best_sweep_solution.children_node[0]
-
-    for node in first_layer_nodes:
+    best_sweep_solution = Solution(instance, best_sweep_edges)
+    for node in best_sweep_solution.children_node[0]:
         edges = cut_branch(best_sweep_solution, node)
         if edges not in host_repository_list:
             host_repository_list.append(edges)
@@ -57,6 +98,29 @@ def initialize_host_repository(instance: Instance, minimum_spanning_tree_branch_
     return host_repository_list
 
 
+def initialize_host_repository(
+    instance: Instance,
+    minimum_spanning_tree_branch_size: int,
+    warm_start: list[list[tuple[int, int]]] | None = None,
+    cache: ArtifactCache | None = None
+) -> list[list[tuple[int, int]]]:
+    best_sweep_edges = _cached(cache, instance, "best_sweep", lambda: best_sweep(instance))
+    host_repository_list = _cached(
+        cache, instance, "host_repository",
+        lambda: _host_repository(instance, minimum_spanning_tree_branch_size, best_sweep_edges),
+        minimum_spanning_tree_branch_size=minimum_spanning_tree_branch_size,
+    )
+
+    if warm_start is not None:
+        for donor in [Solution(instance, edges) for edges in warm_start]:
+            for node in donor.children_node[0]:
+                edges = cut_branch(donor, node)
+                if edges not in host_repository_list:
+                    host_repository_list.append(edges)
+
+    return host_repository_list
+
+
 def single_branch_transposon(solution: Solution):
     first_layer_nodes = list(solution.children_node[0])
 
@@ -69,12 +133,12 @@ def single_branch_transposon(solution: Solution):
         for node_a in branch_nodes:
             for node_b in branch_nodes:
                 if solution.is_node_in_branch(node_a, node_b): continue
-                parent_node_a = solution.parent_node[node_a]
+                solution.begin()
                 solution.move(node_a, node_b)
                 if solution.cost() < best_cost:
                     best_cost = solution.cost()
                     best_solution_edges = solution.get_edges()
-                solution.move(node_a, parent_node_a)
+                solution.rollback()
     solution.build(best_solution_edges)
 
 
@@ -117,6 +181,78 @@ def move_to_better_trasposon(solution: Solution):
         return True
 
 
+def local_search(
+    solution: Solution,
+    first_improvement=True,
+    neighbourhood_size: int = 10,
+    nodes: Iterable[int] | None = None
+) -> bool:
+    """Move-to-better local search driven by a queue of nodes to examine.
+
+    Each turbine (or each of 'nodes', if given) starts in the queue. A node whose
+    neighbourhood yielded no improving move leaves the queue (its don't-look bit
+    is set) and is only examined again when a move touches it, a node on the
+    old or new parent's path to the substation, or a child of one of those.
+    Once the queue runs dry after a move, the starting nodes are examined once
+    more, so the search only stops when none of them has an improving move.
+    Candidate parents are the 'neighbourhood_size' nearest nodes plus the
+    substation (all nodes if negative). Return True if the solution improved."""
+    instance = solution.instance
+    if neighbourhood_size < 0: neighbourhood_size = instance.n
+    candidates = [
+        [0] + [int(node) for node in np.argsort(instance.distance[node_a])[:neighbourhood_size + 1] if node != 0]
+        for node_a in instance.nodes
+    ]
+
+    if nodes is None: nodes = instance.nodes[1::]
+    nodes = [int(node) for node in nodes if node != 0]
+    queue: deque[int] = deque()
+    in_queue = [False for _ in instance.nodes]
+    def enqueue(nodes: Iterable[int]):
+        for node in nodes:
+            if not in_queue[node]:
+                in_queue[node] = True
+                queue.append(node)
+    enqueue(nodes)
+    improved = False
+    moved = False
+
+    while len(queue) > 0:
+        node_a = queue.popleft()
+        in_queue[node_a] = False
+        best_parent: int | None = None
+        best_cost = solution.cost()
+        for node_b in candidates[node_a]:
+            if node_b == node_a or node_b == solution.parent_node[node_a]: continue
+            if solution.is_node_in_branch(node_a, node_b): continue
+            solution.move(node_a, node_b, save_state=True)
+            cost = solution.cost()
+            solution.move_back()
+            if cost < best_cost:
+                best_parent = node_b
+                best_cost = cost
+                if first_improvement: break
+        if best_parent is not None:
+            old_parent = solution.parent_node[node_a]
+            solution.move(node_a, best_parent)
+            improved = moved = True
+            # The move changes the power, hence the cable costs, along both root paths.
+            touched = [node_a]
+            for node in (old_parent, best_parent):
+                while node != 0:
+                    touched.append(node)
+                    node = solution.parent_node[node]
+            enqueue(touched + [child for node in touched for child in solution.children_node[node]])
+
+        if len(queue) == 0 and moved:
+            # Moves also change the powers seen by nodes off those paths, so check
+            # the starting nodes once more before declaring a local optimum.
+            moved = False
+            enqueue(nodes)
+
+    return improved
+
+
 def plasmid(solution: Solution, edges: list[tuple[int, int]]):
     solution_edges = solution.get_edges()
     for node in solution.instance.nodes[1::]:
@@ -139,16 +275,52 @@ def transgenetic(
     prob_plasmid: float,
     prob_sb_transposon: float,
     number_of_generations: int,
-    seed: int=0
+    seed: int=0,
+    final_local_search: bool=True,
+    local_search_population: bool=False,
+    history: list[tuple[int, list[tuple[int, int]]]] | None = None,
+    on_incumbent: Callable[[int, list[tuple[int, int]]], None] | None = None,
+    store: SolutionStore | None = None,
+    warm_start_size: int = 5,
+    gap_threshold: float | None = None,
+    stats: dict[str, float] | None = None,
+    cache: ArtifactCache | None = None,
 ):
+    """Run the transgenetic algorithm and return the best individual found.
+
+    If 'history' is given, each improving incumbent is appended to it as (cost, edges),
+    and if 'on_incumbent' is given, it is called with them.
+    If 'store' is given, the 'warm_start_size' best stored layouts seed the population
+    and the host repository, and the returned individual is saved to the store.
+    If 'gap_threshold' is given, the generations stop once the optimality gap
+    against lower_bound(instance) falls to it. The bound is still too loose for
+    this to tell good layouts apart: the initial population of the shipped
+    instances already shows gaps of 26-28%, about what the best layouts
+    found reach, so no threshold stops early on solution quality alone.
+    If 'stats' is given, it receives the lower bound, the final gap and the
+    number of generations run.
+    If 'cache' is given, the sweeps, the best sweep and the host repository are
+    loaded from it, or computed and stored on the first run."""
     random.seed(seed)
+    bound = lower_bound(instance)
 
-    population = generate_population(instance, pop_size)
-    host_repository = initialize_host_repository(instance, minimum_spanning_tree_branch_size)
+    warm_start = store.best(instance, warm_start_size) if store is not None else None
+    population = generate_population(instance, pop_size, warm_start, cache)
+    host_repository = initialize_host_repository(instance, minimum_spanning_tree_branch_size, warm_start, cache)
     overall_best_cost = min([solution.cost() for solution in population])
+    def record_incumbent(cost: int, edges: list[tuple[int, int]]):
+        if history is not None: history.append((cost, edges))
+        if on_incumbent is not None: on_incumbent(cost, edges)
+    track_incumbents = history is not None or on_incumbent is not None
+
+    if track_incumbents:
+        best = min(population, key=lambda solution: solution.cost())
+        record_incumbent(overall_best_cost, best.get_edges())
     count_number_of_generations = 0
 
     while count_number_of_generations < number_of_generations:
+        if gap_threshold is not None and optimality_gap(overall_best_cost, bound) <= gap_threshold:
+            break
         for solution in population:
             cost = solution.cost()
             edges = solution.get_edges()
@@ -166,18 +338,43 @@ def transgenetic(
                 solution.build(edges)
 
             if new_cost <= overall_best_cost:
+                if track_incumbents and new_cost < overall_best_cost:
+                    record_incumbent(new_cost, solution.get_edges())
                 overall_best_cost = new_cost
                 host_repository.append(cut_branch(solution, random.choice(list(solution.children_node[0]))))
         count_number_of_generations += 1
 
-    # for solution in population:
-    #     while move_to_better_trasposon(solution):
-    #         pass
+    if final_local_search and local_search_population:
+        for solution in population:
+            local_search(solution)
 
     solution = population[0]
     for individual in population:
         if individual.cost() < solution.cost():
             solution = individual
+
+    if final_local_search and not local_search_population:
+        local_search(solution)
+
+    if track_incumbents and solution.cost() < overall_best_cost:
+        record_incumbent(solution.cost(), solution.get_edges())
+
+    if stats is not None:
+        stats["lower_bound"] = bound
+        stats["gap"] = optimality_gap(solution.cost(), bound)
+        stats["generations"] = count_number_of_generations
+
+    if store is not None:
+        store.save(solution, seed, {
+            "pop_size": pop_size,
+            "minimum_spanning_tree_branch_size": minimum_spanning_tree_branch_size,
+            "prob_plasmid": prob_plasmid,
+            "prob_sb_transposon": prob_sb_transposon,
+            "number_of_generations": number_of_generations,
+            "final_local_search": final_local_search,
+            "local_search_population": local_search_population,
+        })
+
     return solution
 
 
@@ -203,6 +400,8 @@ def transgenetic_debug(
     print(f"Minimum cost: {min([solution.cost() for solution in population])}.")
     overall_best_cost = min([solution.cost() for solution in population])
     print(f"Overall best cost: {overall_best_cost}.")
+    bound = lower_bound(instance)
+    print(f"Lower bound: {bound:.0f}. Gap: {optimality_gap(overall_best_cost, bound):.2%}.")
     print("Initializing host_repository...")
     host_repository = initialize_host_repository(instance, minimum_spanning_tree_branch_size)
     print(f"Host repository initialized with size {len(host_repository)}.")
@@ -253,7 +452,8 @@ def transgenetic_debug(
             f"    Number of times new overall best cost was found: {_count_obc}\n"
             f"    New maximum cost: {max([solution.cost() for solution in population])}\n"
             f"    New medium cost: {sum([solution.cost() for solution in population])/len(population):.0f}\n"
-            f"    New minimum cost: {min([solution.cost() for solution in population])}"
+            f"    New minimum cost: {min([solution.cost() for solution in population])}\n"
+            f"    Gap: {optimality_gap(overall_best_cost, bound):.2%}"
         )
 
     print("Generations finished.")
@@ -266,6 +466,7 @@ def transgenetic_debug(
     print(f"New maximum cost: {max([solution.cost() for solution in population])}.")
     print(f"New medium cost: {sum([solution.cost() for solution in population])/len(population):.0f}.")
     print(f"New minimum cost: {min([solution.cost() for solution in population])}.")
+    print(f"Gap: {optimality_gap(min([solution.cost() for solution in population]), bound):.2%}.")
     print("Transgenetic Algorithm Finished.")
 
     return population
@@ -0,0 +1,137 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from statistics import NormalDist
+from time import perf_counter
+from typing import Any
+
+from cache import ArtifactCache
+from instance import Instance
+from transgenetic import transgenetic
+
+PARAMETERS = ("pop_size", "minimum_spanning_tree_branch_size", "prob_plasmid", "prob_sb_transposon")
+
+
+def configurations_grid(
+    pop_size: list[int],
+    minimum_spanning_tree_branch_size: list[float],
+    prob_plasmid: list[float],
+    prob_sb_transposon: list[float]
+) -> list[dict[str, Any]]:
+    """Every combination of the given parameter values.
+
+    A minimum_spanning_tree_branch_size below 1 is a fraction of the instance's n."""
+    return [
+        dict(zip(PARAMETERS, values))
+        for values in itertools.product(pop_size, minimum_spanning_tree_branch_size, prob_plasmid, prob_sb_transposon)
+    ]
+
+
+def _run(args) -> tuple[int, float]:
+    instance, configuration, number_of_generations, seed, cache = args
+    configuration = dict(configuration)
+    if configuration["minimum_spanning_tree_branch_size"] < 1:
+        configuration["minimum_spanning_tree_branch_size"] = max(1, int(configuration["minimum_spanning_tree_branch_size"] * instance.n))
+    start = perf_counter()
+    solution = transgenetic(instance, number_of_generations=number_of_generations, seed=seed, cache=cache, **configuration)
+    return solution.cost(), perf_counter() - start
+
+
+def _ranks(costs: list[float]) -> list[float]:
+    """Ranks from 1 (cheapest), ties getting their average rank"""
+    order = sorted(range(len(costs)), key=lambda i: costs[i])
+    ranks = [0.0 for _ in costs]
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and costs[order[j+1]] == costs[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def _friedman_survivors(rank_sums: list[float], blocks: int, alpha: float) -> list[int]:
+    """Indices that are not significantly worse than the best, by a Friedman test and its post-hoc comparison.
+
+    The chi-square quantile uses the Wilson-Hilferty approximation and the
+    pairwise test the normal approximation of rank sum differences."""
+    k = len(rank_sums)
+    statistic = 12 / (blocks * k * (k + 1)) * sum(R * R for R in rank_sums) - 3 * blocks * (k + 1)
+    z = NormalDist().inv_cdf(1 - alpha)
+    degrees = k - 1
+    critical = degrees * (1 - 2 / (9 * degrees) + z * sqrt(2 / (9 * degrees))) ** 3
+    if statistic <= critical:
+        return list(range(k))
+    best = min(rank_sums)
+    difference = z * sqrt(blocks * k * (k + 1) / 6)
+    return [i for i in range(k) if rank_sums[i] - best <= difference]
+
+
+def race(
+    configurations: list[dict[str, Any]],
+    instances: list[Instance],
+    seeds: list[int],
+    number_of_generations: int,
+    first_test: int = 5,
+    alpha: float = 0.05,
+    max_workers: int | None = None,
+    cache_dir: str | None = None
+) -> list[dict[str, Any]]:
+    """F-race over the transgenetic parameters.
+
+    Each task is an (instance, seed) pair; every surviving configuration runs
+    it in a process pool. From the 'first_test'-th task on, configurations
+    significantly worse than the best (Friedman test on per-task cost ranks)
+    are dropped. Return the survivors, best mean rank first, with their costs
+    and times per task."""
+    tasks = [(instance, seed) for seed in seeds for instance in instances]
+    alive = list(range(len(configurations)))
+    costs: list[list[float]] = [[] for _ in configurations]
+    times: list[list[float]] = [[] for _ in configurations]
+    cache = ArtifactCache(cache_dir) if cache_dir is not None else None
+
+    # Workers attach to the instances' shared memory instead of unpickling their arrays.
+    published = [instance for instance in instances if instance.shared_name is None]
+    for instance in published:
+        instance.publish()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for task, (instance, seed) in enumerate(tasks):
+                results = executor.map(_run, [
+                    (instance, configurations[i], number_of_generations, seed, cache) for i in alive
+                ])
+                for i, (cost, seconds) in zip(alive, results):
+                    costs[i].append(cost)
+                    times[i].append(seconds)
+
+                if task + 1 >= first_test and len(alive) > 1:
+                    rank_sums = [0.0 for _ in alive]
+                    for block in range(task + 1):
+                        for j, rank in enumerate(_ranks([costs[i][block] for i in alive])):
+                            rank_sums[j] += rank
+                    alive = [alive[j] for j in _friedman_survivors(rank_sums, task + 1, alpha)]
+    finally:
+        for instance in published:
+            instance.unpublish()
+
+    blocks = len(tasks)
+    rank_sums = [0.0 for _ in alive]
+    for block in range(blocks):
+        for j, rank in enumerate(_ranks([costs[i][block] for i in alive])):
+            rank_sums[j] += rank
+
+    survivors = [
+        {
+            "configuration": configurations[i],
+            "mean_rank": rank_sums[j] / blocks,
+            "mean_cost": sum(costs[i]) / blocks,
+            "mean_time": sum(times[i]) / blocks,
+            "costs": costs[i],
+            "times": times[i],
+        }
+        for j, i in enumerate(alive)
+    ]
+    survivors.sort(key=lambda survivor: survivor["mean_rank"])
+    return survivors
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cache import ArtifactCache
+from instance import Instance
+from transgenetic import generate_population, initialize_host_repository, transgenetic
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(self.directory.name)
+        self.instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_returns_what_was_put(self):
+        self.assertIsNone(self.cache.get(self.instance, "artifact", size=3))
+        self.cache.put(self.instance, "artifact", [(1, 0)], size=3)
+        self.assertEqual(self.cache.get(self.instance, "artifact", size=3), [(1, 0)])
+        self.assertIsNone(self.cache.get(self.instance, "artifact", size=4))
+
+    def test_artifacts_are_kept_per_C(self):
+        self.cache.put(self.instance, "artifact", 1)
+        other = Instance(INSTANCE_DIR, "n50_s01_t01_w01", self.instance.C + 1)
+        self.assertIsNone(self.cache.get(other, "artifact"))
+
+    def test_cached_artifacts_match_fresh_ones(self):
+        population = [individual.get_edges() for individual in generate_population(self.instance, 6)]
+        host_repository = initialize_host_repository(self.instance, 5)
+        for _ in range(2):
+            with self.subTest(cached=len(os.listdir(self.directory.name)) > 0):
+                self.assertEqual([individual.get_edges() for individual in generate_population(self.instance, 6, cache=self.cache)], population)
+                self.assertEqual(initialize_host_repository(self.instance, 5, cache=self.cache), host_repository)
+
+    def test_transgenetic_is_unchanged_by_the_cache(self):
+        fresh = transgenetic(self.instance, 4, 5, 0.5, 0.5, 1, seed=3)
+        for _ in range(2):
+            cached = transgenetic(self.instance, 4, 5, 0.5, 0.5, 1, seed=3, cache=self.cache)
+            self.assertEqual(cached.get_edges(), fresh.get_edges())
+
+
+if __name__ == "__main__":
+    unittest.main()
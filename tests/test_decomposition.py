@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from decomposition import sectors, transgenetic_sectors
+from generator import generate_instance
+from instance import Instance
+from utils import is_proper_tree
+
+
+class TestDecomposition(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # The generator puts the substation inside the farm.
+        self.instance = Instance(self.directory.name, generate_instance(self.directory.name, 60, "jittered_grid", seed=1))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sectors_partition_the_turbines(self):
+        groups = sectors(self.instance, 24)
+        self.assertEqual(sorted(turbine for [turbines, _] in groups for turbine in turbines), list(range(1, self.instance.n + 1)))
+        self.assertEqual(sum(C for [_, C] in groups), self.instance.C)
+
+    def test_transgenetic_sectors_returns_a_proper_tree(self):
+        solution = transgenetic_sectors(self.instance, 24, 4, 5, 0.9, 0.5, 1, max_workers=2)
+        self.assertTrue(is_proper_tree(solution.children_node, 0))
+        self.assertLessEqual(solution.connections_to_substation(), self.instance.C)
+        self.assertEqual(solution.number_of_crossings(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
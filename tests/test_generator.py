@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from generator import CABLE_CATALOGUES, LAYOUTS, generate_instance, generate_positions
+from instance import Instance
+from transgenetic import transgenetic
+from utils import is_proper_tree
+
+
+class TestGenerator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_positions_are_deterministic(self):
+        for layout in LAYOUTS:
+            with self.subTest(layout=layout):
+                positions = generate_positions(40, layout, seed=3)
+                self.assertEqual(positions.shape, (40, 2))
+                self.assertTrue((positions == generate_positions(40, layout, seed=3)).all())
+
+    def test_default_C_is_feasible(self):
+        for catalogue in CABLE_CATALOGUES:
+            with self.subTest(catalogue=catalogue):
+                instance = Instance(self.directory.name, generate_instance(self.directory.name, 50, catalogue=catalogue))
+                self.assertGreaterEqual(instance.C * instance.max_cable_capacity, instance.n)
+
+    def test_rejects_infeasible_C(self):
+        with self.assertRaises(ValueError):
+            generate_instance(self.directory.name, 50, C=5)
+
+    def test_transgenetic_solves_every_layout(self):
+        for layout in LAYOUTS:
+            for seed in range(2):
+                with self.subTest(layout=layout, seed=seed):
+                    instance = Instance(self.directory.name, generate_instance(self.directory.name, 40, layout, seed=seed))
+                    solution = transgenetic(instance, 6, 5, 0.9, 0.5, 2, seed=seed)
+                    self.assertTrue(is_proper_tree(solution.children_node, 0))
+                    self.assertLessEqual(solution.connections_to_substation(), instance.C)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import pickle
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from best_sweep import best_sweep
+from instance import Instance
+from solution import Solution
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+def sweep_cost(instance: Instance) -> int:
+    return Solution(instance, best_sweep(instance)).cost()
+
+
+class TestSharedInstance(unittest.TestCase):
+    def setUp(self):
+        self.instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+        self.name = self.instance.publish()
+
+    def tearDown(self):
+        self.instance.unpublish()
+
+    def test_attached_instance_matches_the_published_one(self):
+        attached = Instance.attach(self.name)
+        for field in ("position", "distance", "cables", "cable_indices", "nodes", "delta"):
+            with self.subTest(field=field):
+                self.assertTrue(np.array_equal(getattr(attached, field), getattr(self.instance, field)))
+        self.assertEqual((attached.name, attached.C, attached.Cmin, attached.hash),
+                         (self.instance.name, self.instance.C, self.instance.Cmin, self.instance.hash))
+        self.assertEqual(attached.max_cable_capacity, self.instance.max_cable_capacity)
+
+    def test_attached_arrays_are_read_only(self):
+        attached = Instance.attach(self.name)
+        with self.assertRaises(ValueError):
+            attached.distance[0][1] = 0.0
+
+    def test_publishing_twice_reuses_the_block(self):
+        self.assertEqual(self.instance.publish(), self.name)
+
+    def test_pickling_sends_only_the_name(self):
+        data = pickle.dumps(self.instance)
+        self.assertLess(len(data), 1000)
+        self.assertTrue(np.array_equal(pickle.loads(data).distance, self.instance.distance))
+
+    def test_workers_solve_the_shared_instance(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            costs = list(executor.map(sweep_cost, [self.instance, self.instance]))
+        self.assertEqual(costs, [sweep_cost(self.instance)] * 2)
+
+    def test_unpublish_releases_the_block(self):
+        self.instance.unpublish()
+        self.assertIsNone(self.instance.shared_name)
+        with self.assertRaises(FileNotFoundError):
+            Instance.attach(self.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
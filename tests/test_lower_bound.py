@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from best_sweep import best_sweep
+from generator import LAYOUTS, generate_instance
+from instance import Instance
+from lower_bound import lower_bound, minimum_spanning_tree_length, optimality_gap
+from solution import Solution
+from tools import prim
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+INSTANCES = ("n50_s01_t01_w01", "n80_s01_t02_w01", "n120_s04_t01_w01")
+
+
+class TestLowerBound(unittest.TestCase):
+    def test_minimum_spanning_tree_length_matches_prim(self):
+        instance = Instance(INSTANCE_DIR, INSTANCES[0])
+        edges = prim(instance.nodes, instance.distance, 0)
+        length = sum(instance.distance[node_a][node_b] for [node_a, node_b] in edges)
+        self.assertAlmostEqual(minimum_spanning_tree_length(instance.distance), length, places=3)
+
+    def test_bound_is_below_the_best_sweep(self):
+        for name in INSTANCES:
+            with self.subTest(instance=name):
+                instance = Instance(INSTANCE_DIR, name)
+                cost = Solution(instance, best_sweep(instance)).cost()
+                bound = lower_bound(instance)
+                self.assertGreater(bound, 0)
+                self.assertLessEqual(bound, cost)
+                self.assertTrue(0 <= optimality_gap(cost, bound) < 1)
+
+    def test_bound_is_below_generated_layouts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for layout in LAYOUTS:
+                with self.subTest(layout=layout):
+                    instance = Instance(directory, generate_instance(directory, 40, layout, catalogue="66kv"))
+                    bound = lower_bound(instance)
+                    for edges in (best_sweep(instance), prim(instance.nodes, instance.distance, 0)):
+                        self.assertLessEqual(bound, Solution(instance, edges).cost())
+
+    def test_bound_charges_a_short_substation_capacity(self):
+        instance = Instance(INSTANCE_DIR, INSTANCES[0])
+        # One cable can't carry the whole farm, so every solution pays M2 at least.
+        single = Instance.from_positions("single", instance.position, instance.cables, 1)
+        self.assertGreaterEqual(lower_bound(single, M2=10**9), 10**9)
+
+
+if __name__ == "__main__":
+    unittest.main()
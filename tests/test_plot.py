@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from best_sweep import best_sweep
+from instance import Instance
+from plot import draw, render_history, save
+from solution import Solution
+from tools import prim
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+class TestPlot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+        self.solution = Solution(self.instance, best_sweep(self.instance))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_draw_adds_one_segment_per_edge(self):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        edges = draw(self.solution, figure.add_subplot())
+        self.assertEqual(len(edges.get_segments()), self.instance.n)
+
+    def test_save_writes_the_requested_format(self):
+        for extension in ("png", "svg"):
+            with self.subTest(extension=extension):
+                filename = os.path.join(self.directory.name, f"solution.{extension}")
+                save(self.solution, filename, figsize=(4, 4), dpi=50)
+                self.assertGreater(os.path.getsize(filename), 0)
+
+    def test_render_history_writes_a_frame_per_incumbent(self):
+        prim_edges = prim(self.instance.nodes, self.instance.distance, 0)
+        history = [
+            (Solution(self.instance, prim_edges).cost(), prim_edges),
+            (self.solution.cost(), self.solution.get_edges()),
+        ]
+        filenames = render_history(self.instance, history, self.directory.name, figsize=(4, 4), dpi=50)
+        self.assertEqual([os.path.basename(filename) for filename in filenames],
+                         [f"{self.instance.name}_0000.png", f"{self.instance.name}_0001.png"])
+        for filename in filenames:
+            self.assertGreater(os.path.getsize(filename), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from service import LocalClient, ServiceClient, SolverService
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+INSTANCE = "n50_s01_t01_w01"
+PARAMETERS = dict(
+    pop_size=4,
+    minimum_spanning_tree_branch_size=5,
+    prob_plasmid=0.5,
+    prob_sb_transposon=0.5,
+    number_of_generations=0,
+)
+# A job that runs until it is cancelled.
+ENDLESS = dict(PARAMETERS, number_of_generations=10**6)
+
+
+async def events_of(client, **parameters) -> list[dict]:
+    return [event async for event in client.solve(INSTANCE_DIR, INSTANCE, **parameters)]
+
+
+class TestSolverService(unittest.IsolatedAsyncioTestCase):
+    async def test_job_streams_incumbents_until_done(self):
+        events = await events_of(LocalClient(SolverService(max_workers=1)), **PARAMETERS)
+        self.assertEqual([event["event"] for event in events[:2]], ["queued", "started"])
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertEqual(events[-1]["cost"], min(event["cost"] for event in events if "cost" in event))
+
+    async def test_cancelling_a_queued_consumer_frees_its_slot(self):
+        service = SolverService(max_workers=1)
+        client = LocalClient(service)
+        running = asyncio.ensure_future(events_of(client, **PARAMETERS))
+        await asyncio.sleep(0.1)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(events_of(client, **PARAMETERS), 0.3)
+        await running
+        events = await asyncio.wait_for(events_of(client, **PARAMETERS), 60)
+        self.assertEqual(events[-1]["event"], "done")
+
+    async def test_disconnecting_while_queued_cancels_the_job(self):
+        service = SolverService(max_workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = os.path.join(directory, "service.sock")
+            server = await asyncio.start_unix_server(service.handle, socket_path)
+            async with server:
+                client = ServiceClient(socket_path)
+                running = asyncio.ensure_future(events_of(client, **PARAMETERS))
+                await asyncio.sleep(0.1)
+                queued = client.solve(INSTANCE_DIR, INSTANCE, **ENDLESS)
+                self.assertEqual((await anext(queued))["event"], "queued")
+                await queued.aclose()
+                await running
+                # Had the endless job kept its place in the queue, this one could never start.
+                events = await asyncio.wait_for(events_of(client, **PARAMETERS), 60)
+                self.assertEqual(events[-1]["event"], "done")
+
+    async def test_stream_ends_after_done_while_other_jobs_run(self):
+        service = SolverService(max_workers=2)
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = os.path.join(directory, "service.sock")
+            server = await asyncio.start_unix_server(service.handle, socket_path)
+            async with server:
+                # Read the raw stream up to EOF: no other job's process may hold the connection open.
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                request = {"op": "solve", "instance_dir": INSTANCE_DIR, "instance": INSTANCE, "parameters": PARAMETERS}
+                writer.write((json.dumps(request) + "\n").encode())
+                await writer.drain()
+                self.assertEqual(json.loads(await reader.readline())["event"], "queued")
+                self.assertEqual(json.loads(await reader.readline())["event"], "started")
+
+                # Forked while the first connection is open.
+                endless = ServiceClient(socket_path).solve(INSTANCE_DIR, INSTANCE, **ENDLESS)
+                self.assertEqual((await anext(endless))["event"], "queued")
+                self.assertEqual((await anext(endless))["event"], "started")
+
+                lines = await asyncio.wait_for(reader.read(), 60)
+                writer.close()
+                self.assertEqual(json.loads(lines.splitlines()[-1])["event"], "done")
+
+                await endless.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from best_sweep import best_sweep
+from instance import Instance
+from solution import Solution
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+def state(solution: Solution):
+    return (
+        list(solution.parent_node),
+        list(solution.node_power),
+        [sorted(children) for children in solution.children_node],
+        solution.cost(),
+    )
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+        self.solution = Solution(self.instance, best_sweep(self.instance))
+        self.random = random.Random(1)
+
+    def random_move(self) -> tuple[int, int]:
+        while True:
+            node_a = self.random.randint(1, self.instance.n)
+            node_b = self.random.randint(0, self.instance.n)
+            if node_b != self.solution.parent_node[node_a] and not self.solution.is_node_in_branch(node_a, node_b):
+                return node_a, node_b
+
+    def assertConsistent(self):
+        rebuilt = Solution(self.instance, self.solution.get_edges())
+        self.assertEqual(state(rebuilt), state(self.solution))
+
+    def test_move_back_restores_the_state(self):
+        before = state(self.solution)
+        self.solution.move(*self.random_move(), save_state=True)
+        self.solution.move_back()
+        self.assertEqual(state(self.solution), before)
+
+    def test_rollback_undoes_every_move_since_begin(self):
+        before = state(self.solution)
+        self.solution.begin()
+        for _ in range(20):
+            self.solution.move(*self.random_move())
+        self.solution.rollback()
+        self.assertEqual(state(self.solution), before)
+
+    def test_random_nested_transactions(self):
+        for _ in range(100):
+            outer = state(self.solution)
+            self.solution.begin()
+            for _ in range(self.random.randint(1, 4)):
+                self.solution.move(*self.random_move())
+            inner = state(self.solution)
+            self.solution.begin()
+            for _ in range(self.random.randint(1, 3)):
+                self.solution.move(*self.random_move())
+            self.solution.move(*self.random_move(), save_state=True)
+            self.solution.move_back()
+            if self.random.random() < 0.3:
+                self.solution.build(self.solution.get_edges())
+
+            if self.random.random() < 0.5:
+                self.solution.rollback()
+                self.assertEqual(state(self.solution), inner)
+            else:
+                self.solution.commit()
+            self.assertConsistent()
+            if self.random.random() < 0.5:
+                self.solution.rollback()
+                self.assertEqual(state(self.solution), outer)
+            else:
+                self.solution.commit()
+            self.assertConsistent()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from instance import Instance
+from solution import Solution
+from store import SolutionStore
+from transgenetic import generate_population, ranked_sweeps, transgenetic
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+class TestSolutionStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SolutionStore(os.path.join(self.directory.name, "solutions.sqlite"))
+        self.instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+        self.sweeps = ranked_sweeps(self.instance)[0:3]
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_best_returns_the_cheapest_layouts_first(self):
+        for edges in reversed(self.sweeps):
+            self.store.save(Solution(self.instance, edges), seed=0, parameters={"pop_size": 4})
+        best = self.store.best(self.instance, k=2)
+        self.assertEqual([Solution(self.instance, edges).cost() for edges in best],
+                         [Solution(self.instance, edges).cost() for edges in self.sweeps[0:2]])
+
+    def test_identical_layouts_are_stored_once(self):
+        self.store.save(Solution(self.instance, self.sweeps[0]))
+        self.store.save(Solution(self.instance, self.sweeps[0]), seed=1)
+        self.store.save(Solution(self.instance, self.sweeps[1]))
+        self.assertEqual(len(self.store.best(self.instance, k=10)), 2)
+
+    def test_solutions_are_kept_per_C(self):
+        self.store.save(Solution(self.instance, self.sweeps[0]))
+        other = Instance(INSTANCE_DIR, "n50_s01_t01_w01", self.instance.C + 1)
+        self.assertEqual(self.store.best(other), [])
+
+    def test_warm_start_seeds_the_population(self):
+        warm_start = [self.sweeps[2]]
+        population = generate_population(self.instance, 4, warm_start)
+        self.assertIn(sorted(self.sweeps[2]), [sorted(individual.get_edges()) for individual in population])
+
+    def test_transgenetic_saves_and_reuses_its_result(self):
+        solution = transgenetic(self.instance, 4, 5, 0.5, 0.5, 0, store=self.store)
+        [edges] = self.store.best(self.instance)
+        self.assertEqual(Solution(self.instance, edges).cost(), solution.cost())
+        warm = transgenetic(self.instance, 4, 5, 0.5, 0.5, 0, store=self.store)
+        self.assertLessEqual(warm.cost(), solution.cost())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from best_sweep import best_sweep
+from instance import Instance
+from solution import Solution
+from transgenetic import local_search, move_to_better_trasposon
+from utils import is_proper_tree
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+class TestLocalSearch(unittest.TestCase):
+    def setUp(self):
+        self.instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+        self.solution = Solution(self.instance, best_sweep(self.instance))
+
+    def test_improves_on_the_best_sweep(self):
+        cost = self.solution.cost()
+        self.assertTrue(local_search(self.solution))
+        self.assertLess(self.solution.cost(), cost)
+        self.assertTrue(is_proper_tree(self.solution.children_node, 0))
+
+    def test_full_neighbourhood_ends_at_a_local_optimum(self):
+        local_search(self.solution, first_improvement=False, neighbourhood_size=-1)
+        self.assertFalse(move_to_better_trasposon(self.solution))
+
+    def test_reports_no_improvement_at_a_local_optimum(self):
+        local_search(self.solution, neighbourhood_size=-1)
+        edges = self.solution.get_edges()
+        self.assertFalse(local_search(self.solution, nodes=[1, 2, 3]))
+        self.assertEqual(self.solution.get_edges(), edges)
+
+
+if __name__ == "__main__":
+    unittest.main()
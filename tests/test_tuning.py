@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from instance import Instance
+from tuning import PARAMETERS, _friedman_survivors, _ranks, configurations_grid, race
+
+INSTANCE_DIR = os.path.join(os.path.dirname(__file__), "..", "instances")
+
+
+class TestStatistics(unittest.TestCase):
+    def test_ranks_average_ties(self):
+        self.assertEqual(_ranks([30, 10, 20]), [3.0, 1.0, 2.0])
+        self.assertEqual(_ranks([5, 5, 1, 5]), [3.0, 3.0, 1.0, 3.0])
+
+    def test_equal_configurations_all_survive(self):
+        self.assertEqual(_friedman_survivors([20.0, 20.0, 20.0], 10, 0.05), [0, 1, 2])
+
+    def test_consistently_worse_configurations_are_dropped(self):
+        # Ranked 1, 2 and 3 on each of 10 tasks.
+        self.assertEqual(_friedman_survivors([10.0, 20.0, 30.0], 10, 0.05), [0])
+
+    def test_close_configurations_survive_together(self):
+        self.assertEqual(_friedman_survivors([12.0, 18.0, 30.0], 10, 0.05), [0, 1])
+
+
+class TestRace(unittest.TestCase):
+    def test_grid_covers_every_combination(self):
+        configurations = configurations_grid([4, 6], [0.1, 5], [0.5], [0.5])
+        self.assertEqual(len(configurations), 4)
+        self.assertTrue(all(set(configuration) == set(PARAMETERS) for configuration in configurations))
+
+    def test_race_reports_every_survivor(self):
+        instance = Instance(INSTANCE_DIR, "n50_s01_t01_w01")
+        configurations = configurations_grid([4], [0.1, 5], [0.5], [0.5])
+        survivors = race(configurations, [instance], [0, 1], 0, max_workers=2)
+        self.assertEqual(len(survivors), 2)
+        self.assertEqual(sorted(survivor["mean_rank"] for survivor in survivors), [survivor["mean_rank"] for survivor in survivors])
+        for survivor in survivors:
+            self.assertEqual(len(survivor["costs"]), 2)
+            self.assertEqual(survivor["mean_cost"], sum(survivor["costs"]) / 2)
+        self.assertIsNone(instance.shared_name)
+
+
+if __name__ == "__main__":
+    unittest.main()